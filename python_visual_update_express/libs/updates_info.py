@@ -7,12 +7,18 @@ from semver import Version
 class UpdatesInfo:
     release_versions: List[Version]  # Ordered list of versions from oldest to newest
     release_version_step_lists: dict[str, dict]  # Steps needed per version
+    snapshot_step_lists: dict[str, dict]  # Full snapshot steps per target version
+    jump_step_lists: dict[tuple[str, str], dict]  # Jump steps per (from version, to version)
+    file_sizes: dict[str, int]  # Declared download size in bytes per file
     latest_version: Version
 
     def __init__(self, updatescript: str):
+        self.file_sizes = {}
         self.release_versions = self._get_release_versions(updatescript)
         self.latest_version = self.release_versions[-1] if self.release_versions else None
         self.release_version_step_lists = self._get_all_release_steps(updatescript)
+        self.snapshot_step_lists = self._get_all_snapshot_steps(updatescript)
+        self.jump_step_lists = self._get_all_jump_steps(updatescript)
 
     def get_remaining_release_steps(self, current_version: Version):
         steps = {'files_to_download': []}
@@ -20,21 +26,78 @@ class UpdatesInfo:
         if current_version == self.release_versions[-1]:
             return steps
 
-        current_version_index = self.release_versions.index(current_version)
-        newer_version_nrs = self.release_versions[current_version_index + 1:]
-        newer_versions_steps = []
-        for version_nr in newer_version_nrs:
-            version_str = str(version_nr)
-            newer_versions_steps.append(self.release_version_step_lists[version_str])
-
-        for step in newer_versions_steps:
+        for step in self._get_cheapest_step_path(current_version):
             steps['files_to_download'].extend(step['files_to_download'])
 
-        # Remove duplicates by converting to a set and back (since set keys cannot be duplicate)
-        steps['files_to_download'] = list(set(steps['files_to_download']))
+        # Remove duplicates while keeping the order in which the steps are applied
+        steps['files_to_download'] = list(dict.fromkeys(steps['files_to_download']))
 
         return steps
 
+    def _get_cheapest_step_path(self, current_version: Version) -> List[dict]:
+        # Files that appear in several steps are only downloaded once, so the size of a path is the size of the union
+        # of its files rather than the sum of its steps. Candidate paths are therefore searched depth first, releases
+        # before snapshots and jumps, and a branch is dropped as soon as it cannot beat the cheapest path found so far.
+        cheapest = {'cost': None, 'path': []}
+        self._find_cheapest_step_path(current_version, frozenset(), 0, [], {}, cheapest)
+        return cheapest['path']
+
+    def _find_cheapest_step_path(self, version_nr: Version, files: frozenset[str], non_release_step_count: int,
+                                 path: List[dict], reached_file_sets: dict[str, list], cheapest: dict) -> None:
+        # Paths are compared on their size first and on their number of snapshot and jump steps second, so regular
+        # releases win when paths are equally large
+        cost = (self._get_files_size(files), non_release_step_count)
+        if cheapest['cost'] is not None and cost >= cheapest['cost']:
+            return
+
+        if version_nr == self.latest_version:
+            cheapest['cost'] = cost
+            cheapest['path'] = path
+            return
+
+        # A version that was already reached with a subset of these files can never lead to a cheaper path
+        version_str = str(version_nr)
+        for reached_files, reached_non_release_step_count in reached_file_sets.get(version_str, []):
+            if reached_files <= files and reached_non_release_step_count <= non_release_step_count:
+                return
+        reached_file_sets.setdefault(version_str, []).append((files, non_release_step_count))
+
+        for target_nr, step, is_release in self._get_outgoing_steps(version_nr):
+            self._find_cheapest_step_path(target_nr,
+                                          files.union(step['files_to_download']),
+                                          non_release_step_count + (0 if is_release else 1),
+                                          path + [step],
+                                          reached_file_sets,
+                                          cheapest)
+
+    def _get_outgoing_steps(self, version_nr: Version) -> List[tuple[Version, dict, bool]]:
+        version_index = self.release_versions.index(version_nr)
+        newer_version_nrs = self.release_versions[version_index + 1:]
+        if not newer_version_nrs:
+            return []
+
+        next_version_nr = newer_version_nrs[0]
+        outgoing_steps = [(next_version_nr, self.release_version_step_lists[str(next_version_nr)], True)]
+
+        # Snapshots and jumps with files of unknown size are never used, since they cannot be compared to the releases
+        for target_nr in newer_version_nrs:
+            snapshot_step = self.snapshot_step_lists.get(str(target_nr))
+            if snapshot_step and self._is_step_sized(snapshot_step):
+                outgoing_steps.append((target_nr, snapshot_step, False))
+
+            jump_step = self.jump_step_lists.get((str(version_nr), str(target_nr)))
+            if jump_step and self._is_step_sized(jump_step):
+                outgoing_steps.append((target_nr, jump_step, False))
+
+        return outgoing_steps
+
+    def _is_step_sized(self, step: dict) -> bool:
+        return all(filename in self.file_sizes for filename in step['files_to_download'])
+
+    def _get_files_size(self, files: frozenset[str]) -> int:
+        # Files without a declared size are assumed to be free
+        return sum(self.file_sizes.get(filename, 0) for filename in files)
+
     def _get_release_versions(self, updatescript: str) -> List[Version]:
         match = re.search(r"releases\{([^}]*)}", updatescript, re.DOTALL)
         if not match:
@@ -66,14 +129,54 @@ class UpdatesInfo:
             version_nr = match[0]
             block_content = match[1]
 
-            step = {
-                'files_to_download': self._get_filenames_to_download(block_content)
-            }
-
-            release_steps[version_nr] = step
+            release_steps[version_nr] = self._get_step(block_content)
 
         return release_steps
 
+    def _get_all_snapshot_steps(self, updatescript: str) -> dict:
+        snapshot_steps = {}
+
+        matches = re.findall(r"snapshot:(.*?)\{([^}]*)}", updatescript)
+        if not matches:
+            return {}
+
+        for match in matches:
+            try:
+                version_nr = Version.parse(match[0].strip())
+            except:
+                continue
+
+            block_content = match[1]
+
+            snapshot_steps[str(version_nr)] = self._get_step(block_content)
+
+        return snapshot_steps
+
+    def _get_all_jump_steps(self, updatescript: str) -> dict:
+        jump_steps = {}
+
+        matches = re.findall(r"jump:(.*?)>(.*?)\{([^}]*)}", updatescript)
+        if not matches:
+            return {}
+
+        for match in matches:
+            try:
+                from_version_nr = Version.parse(match[0].strip())
+                to_version_nr = Version.parse(match[1].strip())
+            except:
+                continue
+
+            block_content = match[2]
+
+            jump_steps[(str(from_version_nr), str(to_version_nr))] = self._get_step(block_content)
+
+        return jump_steps
+
+    def _get_step(self, step_content: str) -> dict:
+        return {
+            'files_to_download': self._get_filenames_to_download(step_content),
+        }
+
     def _get_filenames_to_download(self, step_content: str) -> List[str]:
         matches = re.findall(r"DownloadFile:(.*?)\n", step_content)
         if not matches:
@@ -81,6 +184,17 @@ class UpdatesInfo:
 
         filenames = []
         for match in matches:
-            filenames.append(match)
+            filenames.append(self._parse_download_file(match))
 
         return filenames
+
+    def _parse_download_file(self, download_file: str) -> str:
+        # A download size in bytes can be given after the file path, e.g. 'DownloadFile:some-file.txt|2048'. If the same
+        # file is given different sizes, the largest one is used.
+        match = re.fullmatch(r"(.*)\|(\d+)\s*", download_file)
+        if not match:
+            return download_file
+
+        filename = match.group(1)
+        self.file_sizes[filename] = max(self.file_sizes.get(filename, 0), int(match.group(2)))
+        return filename
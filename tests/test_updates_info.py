@@ -0,0 +1,154 @@
+import importlib.util
+from pathlib import Path
+
+from semver import Version
+
+# Load the module directly from its file, since importing the package also loads the PyQt user interface
+UPDATES_INFO_PATH = Path(__file__).parent.parent / 'python_visual_update_express' / 'libs' / 'updates_info.py'
+updates_info_spec = importlib.util.spec_from_file_location('updates_info', UPDATES_INFO_PATH)
+updates_info = importlib.util.module_from_spec(updates_info_spec)
+updates_info_spec.loader.exec_module(updates_info)
+
+RELEASES_SCRIPT = """releases{
+    1.0.0
+    1.0.1
+    2.0.0
+}
+
+release:1.0.0{
+
+}
+
+release:1.0.1{
+    DownloadFile:a.txt|10
+}
+
+release:2.0.0{
+    DownloadFile:b.txt|20
+}
+"""
+
+UNSIZED_RELEASES_SCRIPT = """releases{
+    1.0.0
+    1.0.1
+    2.0.0
+}
+
+release:1.0.0{
+
+}
+
+release:1.0.1{
+    DownloadFile:a.txt
+}
+
+release:2.0.0{
+    DownloadFile:b.txt
+}
+"""
+
+
+def get_files_to_download(updatescript: str, current_version: str) -> list[str]:
+    info = updates_info.UpdatesInfo(updatescript)
+    return info.get_remaining_release_steps(Version.parse(current_version))['files_to_download']
+
+
+def test_releases_only_stay_incremental():
+    assert get_files_to_download(RELEASES_SCRIPT, '1.0.0') == ['a.txt', 'b.txt']
+    assert get_files_to_download(RELEASES_SCRIPT, '1.0.1') == ['b.txt']
+    assert get_files_to_download(RELEASES_SCRIPT, '2.0.0') == []
+
+
+def test_cheaper_snapshot_wins():
+    updatescript = RELEASES_SCRIPT + """
+snapshot:2.0.0{
+    DownloadFile:full.bin|25
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['full.bin']
+    assert get_files_to_download(updatescript, '1.0.1') == ['b.txt']
+
+
+def test_cheaper_jump_wins():
+    updatescript = RELEASES_SCRIPT + """
+jump:1.0.0>2.0.0{
+    DownloadFile:jump.bin|25
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['jump.bin']
+
+
+def test_jump_combines_with_releases():
+    updatescript = RELEASES_SCRIPT + """
+jump:1.0.1>2.0.0{
+    DownloadFile:jump.bin|5
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['a.txt', 'jump.bin']
+
+
+def test_equal_cost_prefers_releases():
+    updatescript = RELEASES_SCRIPT + """
+snapshot:2.0.0{
+    DownloadFile:full.bin|30
+}
+
+jump:1.0.0>2.0.0{
+    DownloadFile:jump.bin|30
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['a.txt', 'b.txt']
+
+
+def test_files_in_several_steps_are_counted_once():
+    release_versions = ['1.0.' + str(patch_nr) for patch_nr in range(31)]
+    updatescript = 'releases{\n' + ''.join(version + '\n' for version in release_versions) + '}\n'
+    updatescript += 'release:1.0.0{\n}\n'
+    for version in release_versions[1:]:
+        updatescript += 'release:' + version + '{\n    DownloadFile:application.exe|4000000\n}\n'
+    updatescript += """
+snapshot:1.0.30{
+    DownloadFile:application.exe|4000000
+    DownloadFile:data.bin|6000000
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['application.exe']
+
+
+def test_unsized_blocks_keep_incremental_behaviour():
+    updatescript = UNSIZED_RELEASES_SCRIPT + """
+snapshot:2.0.0{
+    DownloadFile:full.bin
+}
+
+jump:1.0.0>2.0.0{
+    DownloadFile:jump.bin
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['a.txt', 'b.txt']
+
+
+def test_partially_sized_snapshot_is_not_used():
+    updatescript = RELEASES_SCRIPT + """
+snapshot:2.0.0{
+    DownloadFile:full.bin|1
+    DownloadFile:extra.bin
+}
+"""
+    assert get_files_to_download(updatescript, '1.0.0') == ['a.txt', 'b.txt']
+
+
+def test_block_versions_allow_whitespace():
+    updatescript = RELEASES_SCRIPT + """
+snapshot: 2.0.0{
+    DownloadFile:full.bin|1
+}
+
+jump:1.0.1 > 2.0.0{
+    DownloadFile:jump.bin|1
+}
+"""
+    info = updates_info.UpdatesInfo(updatescript)
+    assert '2.0.0' in info.snapshot_step_lists
+    assert ('1.0.1', '2.0.0') in info.jump_step_lists
+    assert get_files_to_download(updatescript, '1.0.0') == ['full.bin']